@@ -6,31 +6,43 @@ This package provides both cursor-based and offset-based pagination.
 
 from .cursor_pagination import (
     CursorPaginationParams,
+    CursorParams,
     CursorPaginationResponse,
     cursor_paginate,
     encode_cursor,
-    decode_cursor
+    decode_cursor,
+    keyset_paginate,
+    decode_keyset_cursor
 )
 
 from .offset_pagination import (
     OffsetPaginationParams,
+    OffsetParams,
     OffsetPaginationMeta,
     OffsetPaginationResponse,
     offset_paginate,
-    create_pagination_response
+    offset_paginate_cached,
+    create_pagination_response,
+    stream_offset_response
 )
 
 __all__ = [
     # Cursor pagination
     "CursorPaginationParams",
+    "CursorParams",
     "CursorPaginationResponse",
     "cursor_paginate",
     "encode_cursor",
     "decode_cursor",
+    "keyset_paginate",
+    "decode_keyset_cursor",
     # Offset pagination
     "OffsetPaginationParams",
+    "OffsetParams",
     "OffsetPaginationMeta",
     "OffsetPaginationResponse",
     "offset_paginate",
+    "offset_paginate_cached",
     "create_pagination_response",
+    "stream_offset_response",
 ]
@@ -0,0 +1,33 @@
+"""
+Cache Keys for Pagination
+
+Shared helpers for the in-process caches used by cursor and offset pagination
+"""
+
+import hashlib
+import secrets
+from sqlalchemy.orm import Session
+from sqlalchemy import select
+
+
+def query_hash(db: Session, query: select) -> str:
+    """
+    Stable hash of a query's compiled SQL, bound parameters and loader options
+
+    Loader options such as selectinload() change which attributes the loaded
+    objects carry but not the compiled SQL, so they are folded in through the
+    statement's cache key. Statements SQLAlchemy cannot cache get a unique
+    hash, so they never share cache entries.
+    """
+    compiled = query.compile(db.get_bind(), compile_kwargs={"literal_binds": False})
+    digest = hashlib.blake2b(digest_size=16)
+    digest.update(str(compiled).encode())
+    digest.update(repr(sorted(compiled.params.items())).encode())
+
+    cache_key = query._generate_cache_key()
+    if cache_key is None:
+        digest.update(secrets.token_bytes(16))
+    else:
+        digest.update(repr(cache_key.key).encode())
+
+    return digest.hexdigest()
@@ -5,22 +5,83 @@ Efficient pagination for large datasets using cursor-based approach.
 Best for: Infinite scrolling, real-time feeds, large datasets
 """
 
-from typing import Generic, TypeVar, List, Optional
-from pydantic import BaseModel
+import asyncio
+import hashlib
+import hmac
+import logging
+import os
+import secrets
+import time
+from datetime import date, datetime, timedelta, timezone
+from decimal import Decimal
+from operator import attrgetter, gt, lt
+from typing import Any, Generic, Literal, TypeVar, List, Optional, Sequence, Union
+from uuid import UUID
+from pydantic import BaseModel, ConfigDict
 from sqlalchemy.orm import Session
-from sqlalchemy import Column, select
-from base64 import b64encode, b64decode
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.engine import Engine
+from sqlalchemy import Column, select, tuple_
+from base64 import b64decode, urlsafe_b64encode
+
+from .caching import query_hash
 
 T = TypeVar("T")
 
+logger = logging.getLogger(__name__)
+
+# Key used to sign cursors so clients cannot forge cursor values. Set it
+# explicitly when running several workers; the random fallback only works
+# within a single process and invalidates cursors on restart.
+CURSOR_SECRET = os.getenv("PAGINATION_CURSOR_SECRET", "").encode() or secrets.token_bytes(32)
+CURSOR_TAG_SIZE = 8
+
+# Cursor payloads start with a one-byte type tag so integers and timestamps
+# can be packed as binary instead of their (longer) decimal text, and so
+# every value decodes back to its original Python type
+_EPOCH = datetime(1970, 1, 1)
+_EPOCH_UTC = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_MICROSECOND = timedelta(microseconds=1)
+
+# Comparison applied to the cursor column for each paging direction
+_CURSOR_OPERATORS = {"forward": gt, "backward": lt}
+
+# Pages fetched ahead of time by cursor_paginate(prefetch_pool=...), keyed by
+# (query hash, direction, limit, cursor). Each entry is served at most once;
+# at most PREFETCH_CACHE_SIZE pages are held, oldest evicted first.
+PREFETCH_TTL = float(os.getenv("PAGINATION_PREFETCH_TTL", "30"))
+PREFETCH_CACHE_SIZE = int(os.getenv("PAGINATION_PREFETCH_CACHE_SIZE", "64"))
+
+_PREFETCH_CACHE: dict[tuple, tuple[float, List, bool]] = {}
+_PREFETCH_TASKS: set[asyncio.Task] = set()
+
 
 class CursorPaginationParams(BaseModel):
     """Query parameters for cursor pagination"""
     cursor: Optional[str] = None
     limit: int = {{defaultPageSize}}
 
-    class Config:
-        extra = "forbid"
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class CursorParams:
+    """
+    Lightweight, immutable cursor parameters for internal construction
+
+    Skips Pydantic validation; use when the values were already validated at
+    the endpoint boundary (e.g. by FastAPI Query parameters).
+    """
+    __slots__ = ("cursor", "limit")
+
+    def __init__(self, cursor: Optional[str] = None, limit: int = {{defaultPageSize}}):
+        object.__setattr__(self, "cursor", cursor)
+        object.__setattr__(self, "limit", limit)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"CursorParams(cursor={self.cursor!r}, limit={self.limit!r})"
 
 
 class CursorPaginationResponse(BaseModel, Generic[T]):
@@ -31,29 +92,173 @@ class CursorPaginationResponse(BaseModel, Generic[T]):
     has_next: bool = False
     has_previous: bool = False
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
+
+
+def _cursor_tag(payload: bytes) -> bytes:
+    """Truncated HMAC of a cursor payload"""
+    return hmac.new(CURSOR_SECRET, payload, hashlib.blake2s).digest()[:CURSOR_TAG_SIZE]
+
+
+def _pack_cursor_value(value: any) -> bytes:
+    """Serialize a cursor value to bytes, prefixed with its type tag"""
+    if value is None:
+        return b"n"
+
+    if isinstance(value, int) and not isinstance(value, bool):
+        return b"i" + value.to_bytes((value.bit_length() + 8) // 8, "big", signed=True)
+
+    if isinstance(value, datetime):
+        # Microseconds since the epoch; aware values are stored as UTC
+        if value.tzinfo is None:
+            tag, micros = b"d", (value - _EPOCH) // _MICROSECOND
+        else:
+            tag, micros = b"t", (value - _EPOCH_UTC) // _MICROSECOND
+        return tag + micros.to_bytes(8, "big", signed=True)
+
+    if isinstance(value, date):
+        return b"D" + value.toordinal().to_bytes(4, "big")
+
+    if isinstance(value, Decimal):
+        return b"m" + str(value).encode()
+
+    if isinstance(value, UUID):
+        return b"u" + value.bytes
+
+    return b"s" + str(value).encode()
+
+
+def _unpack_cursor_value(payload: bytes) -> Any:
+    """Inverse of _pack_cursor_value"""
+    tag, data = payload[:1], payload[1:]
+    if tag == b"n":
+        return None
+    if tag == b"i":
+        return int.from_bytes(data, "big", signed=True)
+    if tag == b"d":
+        return _EPOCH + int.from_bytes(data, "big", signed=True) * _MICROSECOND
+    if tag == b"t":
+        return _EPOCH_UTC + int.from_bytes(data, "big", signed=True) * _MICROSECOND
+    if tag == b"D":
+        return date.fromordinal(int.from_bytes(data, "big"))
+    if tag == b"m":
+        return Decimal(data.decode())
+    if tag == b"u":
+        return UUID(bytes=data)
+    if tag == b"s":
+        return data.decode()
+    return None
+
+
+def _sign_cursor(payload: bytes) -> str:
+    """Sign a payload and encode it as unpadded URL-safe base64"""
+    return urlsafe_b64encode(payload + _cursor_tag(payload)).rstrip(b"=").decode("ascii")
+
+
+def _verify_cursor(cursor: str) -> Optional[bytes]:
+    """Return the payload of a signed cursor, or None if malformed or forged"""
+    try:
+        raw = b64decode(cursor + "=" * (-len(cursor) % 4), altchars=b"-_", validate=True)
+    except ValueError:  # binascii.Error, or non-ASCII input
+        return None
+
+    payload, tag = raw[:-CURSOR_TAG_SIZE], raw[-CURSOR_TAG_SIZE:]
+    if len(raw) < CURSOR_TAG_SIZE or not hmac.compare_digest(tag, _cursor_tag(payload)):
+        return None
+
+    return payload
 
 
 def encode_cursor(value: any) -> str:
-    """Encode cursor value to base64 string"""
-    return b64encode(str(value).encode()).decode()
+    """Encode cursor value to a signed, unpadded URL-safe base64 string"""
+    return _sign_cursor(_pack_cursor_value(value))
+
 
+def decode_cursor(cursor: str) -> Any:
+    """Decode a cursor string, returning None if it is malformed or forged"""
+    payload = _verify_cursor(cursor)
+    if payload is None:
+        return None
+
+    try:
+        return _unpack_cursor_value(payload)
+    except ValueError:  # UnicodeDecodeError, or a truncated UUID/Decimal
+        return None
+
+
+def _fetch_cursor_page(
+    db: Session,
+    query: select,
+    cursor_column: Column,
+    cursor_value: Any,
+    direction: Literal["forward", "backward"],
+    limit: int,
+    unique: bool = False
+) -> tuple[List, bool]:
+    """Fetch one page after cursor_value, returning (items, has_more)"""
+    # Apply cursor filter (invalid or forged cursors decode to None and are ignored)
+    if cursor_value is not None:
+        query = query.where(_CURSOR_OPERATORS[direction](cursor_column, cursor_value))
+
+    # Fetch limit + 1 to check if there are more items
+    query = query.limit(limit + 1)
+
+    # Execute query; joined eager loads repeat each entity per related row
+    result = db.execute(query)
+    scalars = result.scalars().unique() if unique else result.scalars()
+    items = scalars.fetchmany(limit + 1)
+    result.close()
+
+    # Check if there are more items
+    has_more = len(items) > limit
+    if has_more:
+        items = items[:limit]
+
+    return items, has_more
+
+
+async def _prefetch_page(
+    pool: Engine,
+    query: select,
+    cursor_column: Column,
+    cursor: str,
+    direction: Literal["forward", "backward"],
+    limit: int,
+    unique: bool,
+    cache_key: tuple
+) -> None:
+    """Fetch the page after cursor on its own connection and stash it"""
+    def fetch() -> tuple[List, bool]:
+        with Session(pool, expire_on_commit=False) as session:
+            return _fetch_cursor_page(
+                session, query, cursor_column, decode_cursor(cursor), direction,
+                limit, unique
+            )
 
-def decode_cursor(cursor: str) -> str:
-    """Decode base64 cursor string"""
     try:
-        return b64decode(cursor.encode()).decode()
+        items, has_more = await asyncio.to_thread(fetch)
     except Exception:
-        return ""
+        # Prefetching is best effort; the next request simply queries itself
+        logger.exception("Prefetching cursor page failed")
+        return
+
+    now = time.monotonic()
+    for key in [k for k, v in _PREFETCH_CACHE.items() if now - v[0] >= PREFETCH_TTL]:
+        del _PREFETCH_CACHE[key]
+    # Entries are kept in insertion order, so the first one is the oldest
+    while len(_PREFETCH_CACHE) >= PREFETCH_CACHE_SIZE:
+        del _PREFETCH_CACHE[next(iter(_PREFETCH_CACHE))]
+    _PREFETCH_CACHE[cache_key] = (now, items, has_more)
 
 
 async def cursor_paginate(
     db: Session,
     query: select,
     cursor_column: Column,
-    params: CursorPaginationParams,
-    direction: str = "forward"
+    params: Union[CursorPaginationParams, CursorParams],
+    direction: Literal["forward", "backward"] = "forward",
+    load_options: Sequence[ExecutableOption] = (),
+    prefetch_pool: Optional[Engine] = None
 ) -> tuple[List, Optional[str], Optional[str]]:
     """
     Perform cursor-based pagination on a SQLAlchemy query
@@ -62,8 +267,18 @@ async def cursor_paginate(
         db: Database session
         query: SQLAlchemy select query
         cursor_column: Column to use for cursor (usually id or created_at)
-        params: Pagination parameters
+        params: Pagination parameters (CursorPaginationParams or CursorParams)
         direction: "forward" or "backward"
+        load_options: Loader options such as selectinload(User.orders) or
+            joinedload(User.orders), applied to the page query so
+            relationships are loaded with the page instead of once per row
+        prefetch_pool: Engine used to fetch the next page in the background
+            once this one is returned, so a client following next_cursor is
+            served from memory (for PAGINATION_PREFETCH_TTL seconds, up to
+            PAGINATION_PREFETCH_CACHE_SIZE pages process-wide). The
+            request-scoped session cannot be shared with a background task.
+            Prefetched rows come from a closed session, so eager-load any
+            relationships the response needs via load_options.
 
     Returns:
         Tuple of (items, next_cursor, previous_cursor)
@@ -71,6 +286,7 @@ async def cursor_paginate(
     Example:
         ```python
         from sqlalchemy import select
+        from sqlalchemy.orm import selectinload
         from app.models import User
 
         @app.get("/users")
@@ -79,11 +295,12 @@ async def cursor_paginate(
             limit: int = 20,
             db: Session = Depends(get_db)
         ):
-            params = CursorPaginationParams(cursor=cursor, limit=limit)
+            params = CursorParams(cursor=cursor, limit=limit)
             query = select(User).order_by(User.id.asc())
 
             items, next_cursor, prev_cursor = await cursor_paginate(
-                db, query, User.id, params
+                db, query, User.id, params,
+                load_options=[selectinload(User.orders)]
             )
 
             return CursorPaginationResponse(
@@ -95,31 +312,33 @@ async def cursor_paginate(
             )
         ```
     """
+    if direction not in _CURSOR_OPERATORS:
+        raise ValueError(f"direction must be 'forward' or 'backward', got {direction!r}")
+
     limit = min(params.limit, {{maxPageSize}})
+    get_cursor = attrgetter(cursor_column.name)
 
     # Decode cursor if provided
     cursor_value = None
     if params.cursor:
         cursor_value = decode_cursor(params.cursor)
 
-    # Apply cursor filter
-    if cursor_value:
-        if direction == "forward":
-            query = query.where(cursor_column > cursor_value)
-        else:
-            query = query.where(cursor_column < cursor_value)
+    if load_options:
+        query = query.options(*load_options)
 
-    # Fetch limit + 1 to check if there are more items
-    query = query.limit(limit + 1)
+    # Serve a page prefetched by the previous request if there is one
+    prefetched = None
+    if prefetch_pool is not None:
+        page_query_hash = query_hash(db, query)
+        prefetched = _PREFETCH_CACHE.pop((page_query_hash, direction, limit, params.cursor), None)
 
-    # Execute query
-    result = db.execute(query)
-    items = list(result.scalars().all())
-
-    # Check if there are more items
-    has_more = len(items) > limit
-    if has_more:
-        items = items[:limit]
+    if prefetched is not None and time.monotonic() - prefetched[0] < PREFETCH_TTL:
+        items, has_more = prefetched[1], prefetched[2]
+    else:
+        items, has_more = _fetch_cursor_page(
+            db, query, cursor_column, cursor_value, direction, limit,
+            unique=bool(load_options)
+        )
 
     # Generate cursors
     next_cursor = None
@@ -127,11 +346,128 @@ async def cursor_paginate(
 
     if items:
         if has_more:
-            last_item_cursor = getattr(items[-1], cursor_column.name)
-            next_cursor = encode_cursor(last_item_cursor)
+            next_cursor = encode_cursor(get_cursor(items[-1]))
+
+        if cursor_value is not None:
+            previous_cursor = encode_cursor(get_cursor(items[0]))
 
-        if cursor_value:
-            first_item_cursor = getattr(items[0], cursor_column.name)
-            previous_cursor = encode_cursor(first_item_cursor)
+    # Warm the next page while the client handles this one
+    if prefetch_pool is not None and next_cursor is not None:
+        task = asyncio.create_task(_prefetch_page(
+            prefetch_pool, query, cursor_column, next_cursor, direction, limit,
+            bool(load_options),
+            (page_query_hash, direction, limit, next_cursor)
+        ))
+        _PREFETCH_TASKS.add(task)
+        task.add_done_callback(_PREFETCH_TASKS.discard)
 
     return items, next_cursor, previous_cursor
+
+
+def _encode_keyset_cursor(values: Sequence) -> str:
+    """Encode sort key values as a signed cursor, each packed with its type"""
+    payload = bytearray(b"k")
+    for value in values:
+        packed = _pack_cursor_value(value)
+        payload += len(packed).to_bytes(2, "big") + packed
+    return _sign_cursor(bytes(payload))
+
+
+def decode_keyset_cursor(cursor: str) -> Optional[tuple]:
+    """Decode a cursor produced by keyset_paginate into its sort key values"""
+    payload = _verify_cursor(cursor)
+    if payload is None or payload[:1] != b"k":
+        return None
+
+    values = []
+    position = 1
+    try:
+        while position < len(payload):
+            size = int.from_bytes(payload[position:position + 2], "big")
+            position += 2
+            values.append(_unpack_cursor_value(payload[position:position + size]))
+            position += size
+    except ValueError:  # UnicodeDecodeError, or a truncated UUID/Decimal
+        return None
+
+    return tuple(values)
+
+
+async def keyset_paginate(
+    db: Session,
+    query: select,
+    sort_columns: Sequence[Column],
+    last_values: Optional[tuple],
+    limit: int,
+    load_options: Sequence[ExecutableOption] = ()
+) -> tuple[List, Optional[str]]:
+    """
+    Perform keyset (seek) pagination over one or more sort columns
+
+    Unlike OFFSET, which scans and discards every skipped row, keyset
+    pagination seeks directly past the last row seen with a row-value
+    comparison, e.g. WHERE (created_at, id) > (:created_at, :id), so every
+    page costs the same no matter how deep it is. Migrate offset_paginate
+    callers here once offsets grow large. The sort columns should be covered
+    by an index and end with a unique column to break ties.
+
+    Args:
+        db: Database session
+        query: SQLAlchemy select query, without ORDER BY or LIMIT
+        sort_columns: Columns to order and seek by (ascending)
+        last_values: Sort key values of the last row of the previous page,
+            usually from decode_keyset_cursor(); None for the first page
+        limit: Items per page
+        load_options: Loader options applied to the page query, as in
+            cursor_paginate
+
+    Returns:
+        Tuple of (items, next_cursor)
+
+    Example:
+        ```python
+        @app.get("/users")
+        async def list_users(
+            cursor: Optional[str] = None,
+            limit: int = 20,
+            db: Session = Depends(get_db)
+        ):
+            last_values = decode_keyset_cursor(cursor) if cursor else None
+
+            items, next_cursor = await keyset_paginate(
+                db, select(User), [User.created_at, User.id], last_values, limit
+            )
+
+            return CursorPaginationResponse(
+                data=items,
+                next_cursor=next_cursor,
+                has_next=next_cursor is not None
+            )
+        ```
+    """
+    limit = max(1, min(limit, {{maxPageSize}}))
+
+    if last_values:
+        query = query.where(tuple_(*sort_columns) > tuple_(*last_values))
+
+    if load_options:
+        query = query.options(*load_options)
+
+    # Fetch limit + 1 to check if there are more items
+    query = query.order_by(*sort_columns).limit(limit + 1)
+
+    result = db.execute(query)
+    scalars = result.scalars().unique() if load_options else result.scalars()
+    items = scalars.fetchmany(limit + 1)
+    result.close()
+
+    next_cursor = None
+    if len(items) > limit:
+        items = items[:limit]
+        get_sort_key = attrgetter(*(column.name for column in sort_columns))
+        sort_key = get_sort_key(items[-1])
+        if len(sort_columns) == 1:
+            sort_key = (sort_key,)
+        next_cursor = _encode_keyset_cursor(sort_key)
+
+    return items, next_cursor
@@ -5,14 +5,174 @@ Simple page-based pagination using offset and limit.
 Best for: Small to medium datasets, user-facing pagination with page numbers
 """
 
-from typing import Generic, TypeVar, List
-from pydantic import BaseModel, Field
+import json
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Generic, Iterator, Literal, TypeVar, List, Optional, Sequence, Union
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, ConfigDict, Field, TypeAdapter
 from sqlalchemy.orm import Session
-from sqlalchemy import select, func
-from math import ceil
+from sqlalchemy.sql.base import ExecutableOption
+from sqlalchemy.sql.expression import Select
+from sqlalchemy import func, inspect, select
+
+from .caching import query_hash
+
+try:
+    import orjson
+except ImportError:  # optional: faster row serialization for streamed pages
+    orjson = None
 
 T = TypeVar("T")
 
+# Cached COUNT(*) results keyed by a hash of the compiled count SQL + params.
+# Counting a large table usually costs far more than fetching one page, so
+# totals are reused for a short while instead of recounted on every request.
+COUNT_CACHE_TTL = float(os.getenv("PAGINATION_COUNT_CACHE_TTL", "600"))
+COUNT_CACHE_MIN_ROWS = int(os.getenv("PAGINATION_COUNT_CACHE_MIN_ROWS", "1000"))
+COUNT_CACHE_SIZE = int(os.getenv("PAGINATION_COUNT_CACHE_SIZE", "1024"))
+
+_COUNT_CACHE: dict[str, tuple[float, int]] = {}
+
+# LRU cache of large row chunks used by offset_paginate_cached, keyed by
+# (query hash, chunk size, chunk index). One ORDER BY + LIMIT serves many
+# client pages.
+CHUNK_CACHE_SIZE = int(os.getenv("PAGINATION_CHUNK_CACHE_SIZE", "128"))
+CHUNK_CACHE_TTL = float(os.getenv("PAGINATION_CHUNK_CACHE_TTL", "300"))
+
+_CHUNK_CACHE: "OrderedDict[tuple[str, int, int], tuple[float, List]]" = OrderedDict()
+
+# List[schema] adapters used by create_pagination_response, built once per schema
+_ADAPTERS: dict[type, TypeAdapter] = {}
+
+
+def _selects_filtered_entity(query: Select) -> bool:
+    """Whether the select list holds an entity that adds its own criteria"""
+    for description in query.column_descriptions:
+        info = inspect(description.get("entity"), raiseerr=False)
+        mapper = getattr(info, "mapper", None)
+        # Single-table inheritance subclasses filter on the discriminator
+        if mapper is not None and mapper.single and mapper.inherits is not None:
+            return True
+    return False
+
+
+def _count_query(query: select) -> select:
+    """
+    Build a COUNT(*) query over the rows of a select
+
+    Swapping the select list for count(*) keeps the original FROM and WHERE,
+    so the planner can count straight off the base table's indexes instead
+    of materializing a derived table. Anything where the select list itself
+    shapes the result still counts over a subquery: compound selects
+    (UNION etc.), DISTINCT, GROUP BY and single-table-inheritance entities,
+    whose discriminator filter goes away with the entity. Criteria added
+    through with_loader_criteria() options are not detected; pass an
+    explicit count_query for those.
+    """
+    if (
+        not isinstance(query, Select)
+        or query._distinct
+        or query._group_by_clauses
+        or _selects_filtered_entity(query)
+    ):
+        return select(func.count()).select_from(query.subquery())
+
+    return (
+        query.with_only_columns(func.count(), maintain_column_froms=True)
+        .order_by(None)
+        .limit(None)
+        .offset(None)
+    )
+
+
+def _cached_count(db: Session, count_query: select) -> int:
+    """Execute a count query, serving large totals from the TTL cache"""
+    cache_key = query_hash(db, count_query)
+    cached = _COUNT_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < COUNT_CACHE_TTL:
+        return cached[1]
+
+    total_count = db.execute(count_query).scalar() or 0
+
+    # Small tables are cheap to count; caching them only serves stale totals
+    _COUNT_CACHE.pop(cache_key, None)
+    if total_count >= COUNT_CACHE_MIN_ROWS:
+        now = time.monotonic()
+        for key in [k for k, v in _COUNT_CACHE.items() if now - v[0] >= COUNT_CACHE_TTL]:
+            del _COUNT_CACHE[key]
+        # Entries are kept in insertion order, so the first one is the oldest
+        while len(_COUNT_CACHE) >= COUNT_CACHE_SIZE:
+            del _COUNT_CACHE[next(iter(_COUNT_CACHE))]
+        _COUNT_CACHE[cache_key] = (now, total_count)
+
+    return total_count
+
+
+def _estimated_count(db: Session, query: select) -> Optional[int]:
+    """
+    Read the planner's row estimate for a query instead of counting
+
+    Only supported on PostgreSQL; returns None on other databases so the
+    caller can fall back to an exact count.
+    """
+    bind = db.get_bind()
+    if bind.dialect.name != "postgresql":
+        return None
+
+    # Expand IN lists and other post-compile parameters into real placeholders
+    compiled = query.compile(bind, compile_kwargs={"render_postcompile": True})
+    plan = db.connection().exec_driver_sql(
+        f"EXPLAIN (FORMAT JSON) {compiled}", compiled.params
+    ).scalar()
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def _cached_chunk(
+    db: Session,
+    query: select,
+    query_key: str,
+    chunk_index: int,
+    chunk_size: int
+) -> List:
+    """Fetch one chunk of rows, serving it from the LRU chunk cache when fresh"""
+    cache_key = (query_key, chunk_size, chunk_index)
+    cached = _CHUNK_CACHE.get(cache_key)
+    if cached is not None and time.monotonic() - cached[0] < CHUNK_CACHE_TTL:
+        _CHUNK_CACHE.move_to_end(cache_key)
+        return cached[1]
+
+    chunk_query = query.offset(chunk_index * chunk_size).limit(chunk_size)
+    result = db.execute(chunk_query)
+    rows = result.scalars().fetchmany(chunk_size)
+    result.close()
+
+    _CHUNK_CACHE[cache_key] = (time.monotonic(), rows)
+    _CHUNK_CACHE.move_to_end(cache_key)
+    while len(_CHUNK_CACHE) > CHUNK_CACHE_SIZE:
+        _CHUNK_CACHE.popitem(last=False)
+
+    return rows
+
+
+def _list_adapter(schema: type) -> TypeAdapter:
+    """Return the cached TypeAdapter for List[schema]"""
+    adapter = _ADAPTERS.get(schema)
+    if adapter is None:
+        adapter = _ADAPTERS[schema] = TypeAdapter(List[schema])
+    return adapter
+
+
+def _dump_item(item: BaseModel) -> bytes:
+    """Serialize one validated item to JSON bytes"""
+    if orjson is not None:
+        return orjson.dumps(item.model_dump(mode="json"))
+    return item.model_dump_json().encode()
+
 
 class OffsetPaginationParams(BaseModel):
     """Query parameters for offset pagination"""
@@ -29,18 +189,43 @@ class OffsetPaginationParams(BaseModel):
         """Calculate offset from page number"""
         return (self.page - 1) * self.limit
 
-    class Config:
-        extra = "forbid"
+    model_config = ConfigDict(extra="forbid", frozen=True)
+
+
+class OffsetParams:
+    """
+    Lightweight, immutable offset parameters for internal construction
+
+    Skips Pydantic validation; page and limit must already be checked at the
+    endpoint boundary (e.g. Query(ge=1, le={{maxPageSize}})).
+    """
+    __slots__ = ("page", "limit")
+
+    def __init__(self, page: int = 1, limit: int = {{defaultPageSize}}):
+        object.__setattr__(self, "page", page)
+        object.__setattr__(self, "limit", limit)
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        raise AttributeError(f"{type(self).__name__} is immutable")
+
+    def __repr__(self) -> str:
+        return f"OffsetParams(page={self.page!r}, limit={self.limit!r})"
+
+    @property
+    def offset(self) -> int:
+        """Calculate offset from page number"""
+        return (self.page - 1) * self.limit
 
 
 class OffsetPaginationMeta(BaseModel):
     """Pagination metadata"""
     current_page: int
     page_size: int
-    total_items: int
-    total_pages: int
+    total_items: Optional[int] = None
+    total_pages: Optional[int] = None
     has_next: bool
     has_previous: bool
+    estimated: bool = False
 
 
 class OffsetPaginationResponse(BaseModel, Generic[T]):
@@ -48,102 +233,309 @@ class OffsetPaginationResponse(BaseModel, Generic[T]):
     data: List[T]
     pagination: OffsetPaginationMeta
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 async def offset_paginate(
     db: Session,
     query: select,
-    params: OffsetPaginationParams,
-    count_query: Optional[select] = None
-) -> tuple[List, int]:
+    params: Union[OffsetPaginationParams, OffsetParams],
+    count_query: Optional[select] = None,
+    include_total: bool = True,
+    count_mode: Literal["exact", "estimate", "skip"] = "exact",
+    load_options: Sequence[ExecutableOption] = (),
+    single_query: bool = False
+) -> tuple[List, Optional[int], bool, bool]:
     """
     Perform offset-based pagination on a SQLAlchemy query
 
+    OFFSET makes the database scan and discard every skipped row, so the cost
+    of a page grows with its depth. Keep this for small offsets (page-number
+    UIs over modest tables) and use keyset_paginate for deep pagination.
+
+    has_next is always derived by fetching one extra row with the page, so it
+    stays accurate even when the total is cached, estimated or skipped.
+
     Args:
         db: Database session
         query: SQLAlchemy select query
-        params: Pagination parameters
-        count_query: Optional separate count query (for optimization)
+        params: Pagination parameters (OffsetPaginationParams or OffsetParams)
+        count_query: Optional separate count query (for optimization).
+            Totals of at least PAGINATION_COUNT_CACHE_MIN_ROWS rows are cached
+            for PAGINATION_COUNT_CACHE_TTL seconds, so they may lag behind
+            recent inserts and deletes.
+        include_total: Set to False to skip counting (same as count_mode="skip")
+        count_mode: How to compute the total:
+            - "exact": COUNT(*) over the query (default)
+            - "estimate": planner row estimate via EXPLAIN. Only used on
+              PostgreSQL and without count_query; otherwise it falls back
+              to an exact count, reported through the estimated flag
+            - "skip": no count at all; total_count is None
+        load_options: Loader options such as selectinload(User.orders) to
+            eager-load relationships of the page (not applied to the count)
+        single_query: With count_mode="exact", return the total alongside the
+            rows via COUNT(*) OVER () instead of a separate count query. Saves
+            a round trip, but the window rules out index-only scans, so it
+            pays off mainly for selective filters. Bypasses the count cache.
+            Ignored for compound selects, which use the separate count.
 
     Returns:
-        Tuple of (items, total_count)
+        Tuple of (items, total_count, has_next, estimated), where estimated
+        is True only if total_count is a planner estimate
 
     Example:
         ```python
         from sqlalchemy import select
+        from sqlalchemy.orm import selectinload
         from app.models import User
 
         @app.get("/users", response_model=OffsetPaginationResponse[UserSchema])
         async def list_users(
-            page: int = 1,
-            limit: int = 20,
+            page: int = Query(1, ge=1),
+            limit: int = Query(20, ge=1, le={{maxPageSize}}),
             db: Session = Depends(get_db)
         ):
-            params = OffsetPaginationParams(page=page, limit=limit)
+            params = OffsetParams(page=page, limit=limit)
             query = select(User).order_by(User.created_at.desc())
 
-            items, total = await offset_paginate(db, query, params)
-
-            return OffsetPaginationResponse(
-                data=items,
-                pagination=OffsetPaginationMeta(
-                    current_page=params.page,
-                    page_size=params.limit,
-                    total_items=total,
-                    total_pages=ceil(total / params.limit),
-                    has_next=params.page < ceil(total / params.limit),
-                    has_previous=params.page > 1
-                )
+            items, total, has_next, estimated = await offset_paginate(
+                db, query, params,
+                count_mode="estimate",
+                load_options=[selectinload(User.orders)]
+            )
+
+            return create_pagination_response(
+                items, total, params.page, params.limit,
+                has_next=has_next,
+                estimated=estimated
             )
         ```
     """
+    if not include_total:
+        count_mode = "skip"
+
+    # The window count only stands in for the default count query, and
+    # compound selects (UNION etc.) have no add_columns()
+    use_window = (
+        single_query
+        and count_mode == "exact"
+        and count_query is None
+        and isinstance(query, Select)
+    )
+
     # Get total count
+    total_count = None
+    if count_mode == "estimate" and count_query is None:
+        total_count = _estimated_count(db, query)
+    estimated = total_count is not None
+
     if count_query is None:
         # Use the same query but select count
-        count_query = select(func.count()).select_from(query.subquery())
+        count_query = _count_query(query)
 
-    total_count = db.execute(count_query).scalar() or 0
+    if total_count is None and count_mode != "skip" and not use_window:
+        total_count = _cached_count(db, count_query)
+
+    if load_options:
+        query = query.options(*load_options)
 
-    # Apply offset and limit
-    paginated_query = query.offset(params.offset).limit(params.limit)
+    paginated_query = query
+    if use_window:
+        # COUNT(*) OVER () is computed over the filtered rows before OFFSET/LIMIT
+        paginated_query = query.add_columns(func.count().over().label("_total"))
 
-    # Execute query
+    # Apply offset and limit, fetching limit + 1 to check if there are more items
+    paginated_query = paginated_query.offset(params.offset).limit(params.limit + 1)
+
+    # Execute query; joined eager loads repeat each entity per related row
     result = db.execute(paginated_query)
-    items = list(result.scalars().all())
+    if load_options:
+        result = result.unique()
+    if use_window:
+        rows = result.fetchmany(params.limit + 1)
+        items = [row[0] for row in rows]
+        if rows:
+            total_count = rows[0]._total
+    else:
+        items = result.scalars().fetchmany(params.limit + 1)
+    result.close()
+
+    if use_window and total_count is None:
+        # Past the last page there is no row to read the total from
+        total_count = _cached_count(db, count_query) if params.offset else 0
+
+    # Check if there are more items
+    has_next = len(items) > params.limit
+    if has_next:
+        items = items[:params.limit]
+
+    return items, total_count, has_next, estimated
+
+
+async def offset_paginate_cached(
+    db: Session,
+    query: select,
+    params: Union[OffsetPaginationParams, OffsetParams],
+    chunk_size: int = 1000
+) -> tuple[List, None, bool, bool]:
+    """
+    Offset pagination served from cached chunks of chunk_size rows
+
+    Paging 1 -> 2 -> 3 with offset_paginate re-runs the same ORDER BY for
+    every page. Here the query is fetched chunk_size rows at a time and each
+    chunk is kept in a process-wide LRU cache (PAGINATION_CHUNK_CACHE_SIZE
+    chunks for PAGINATION_CHUNK_CACHE_TTL seconds), so adjacent pages are
+    sliced from memory. No total is counted.
+
+    Cached rows are shared across requests and sessions: use this for
+    read-only listings, selecting plain columns or using a session with
+    expire_on_commit=False so cached ORM objects stay readable.
+
+    Args:
+        db: Database session
+        query: SQLAlchemy select query (must have a deterministic ORDER BY)
+        params: Pagination parameters
+        chunk_size: Rows fetched per backend query (should be >= params.limit)
+
+    Returns:
+        Tuple of (items, None, has_next, False), matching offset_paginate
+    """
+    chunk_query_hash = query_hash(db, query)
+    chunk_index, chunk_offset = divmod(params.offset, chunk_size)
 
-    return items, total_count
+    chunk = _cached_chunk(db, query, chunk_query_hash, chunk_index, chunk_size)
+    items = chunk[chunk_offset:]
+
+    # Pull in following chunks until we have limit + 1 rows or run out
+    while len(items) <= params.limit and len(chunk) == chunk_size:
+        chunk_index += 1
+        chunk = _cached_chunk(db, query, chunk_query_hash, chunk_index, chunk_size)
+        items.extend(chunk)
+
+    has_next = len(items) > params.limit
+    return items[:params.limit], None, has_next, False
 
 
 def create_pagination_response(
     items: List[T],
-    total_items: int,
+    total_items: Optional[int],
     page: int,
-    limit: int
+    limit: int,
+    has_next: Optional[bool] = None,
+    estimated: bool = False,
+    schema: Optional[type[T]] = None
 ) -> OffsetPaginationResponse[T]:
     """
     Helper function to create pagination response
 
     Args:
         items: List of items for current page
-        total_items: Total number of items
+        total_items: Total number of items, or None if it was not counted
         page: Current page number
         limit: Items per page
+        has_next: Whether another page exists (as returned by offset_paginate);
+            required when total_items is None
+        estimated: Whether total_items is a planner estimate (as returned by
+            offset_paginate)
+        schema: Optional Pydantic model for the items. When given, the whole
+            page is validated in one call through a cached TypeAdapter
+            instead of model by model; return the result as
+            Response(response.model_dump_json(), media_type="application/json")
+            to also skip FastAPI's response_model re-validation.
 
     Returns:
         OffsetPaginationResponse with populated metadata
     """
-    total_pages = ceil(total_items / limit) if limit > 0 else 0
-
-    return OffsetPaginationResponse(
-        data=items,
-        pagination=OffsetPaginationMeta(
-            current_page=page,
-            page_size=limit,
-            total_items=total_items,
-            total_pages=total_pages,
-            has_next=page < total_pages,
-            has_previous=page > 1
-        )
+    total_pages = None
+    if total_items is not None:
+        total_pages = (total_items + limit - 1) // limit if limit else 0
+
+    if has_next is None:
+        has_next = total_pages is not None and page < total_pages
+
+    pagination = OffsetPaginationMeta(
+        current_page=page,
+        page_size=limit,
+        total_items=total_items,
+        total_pages=total_pages,
+        has_next=has_next,
+        has_previous=page > 1,
+        estimated=estimated
     )
+
+    if schema is not None:
+        data = _list_adapter(schema).validate_python(items, from_attributes=True)
+        return OffsetPaginationResponse[schema].model_construct(
+            data=data, pagination=pagination
+        )
+
+    return OffsetPaginationResponse(data=items, pagination=pagination)
+
+
+def stream_offset_response(
+    db: Session,
+    query: select,
+    params: Union[OffsetPaginationParams, OffsetParams],
+    schema: type[BaseModel],
+    load_options: Sequence[ExecutableOption] = ()
+) -> StreamingResponse:
+    """
+    Stream an offset page as JSON while rows are fetched
+
+    Rows are read from the driver in batches, validated with schema and
+    written out one by one (with orjson when installed), so large pages
+    never build the full list or response body in memory and the client can
+    start parsing early. The body has the same shape as
+    OffsetPaginationResponse; no total is counted.
+
+    The session must stay open until the body has been sent, so do not close
+    it in a dependency that exits before the response is streamed.
+
+    Args:
+        db: Database session
+        query: SQLAlchemy select query
+        params: Pagination parameters
+        schema: Pydantic model used to serialize each item
+        load_options: Loader options applied to the page query. Rows are
+            streamed with yield_per, which SQLAlchemy does not allow together
+            with joinedload() of collections or subqueryload(); use
+            selectinload() here.
+
+    Returns:
+        StreamingResponse with media type application/json
+    """
+    if load_options:
+        query = query.options(*load_options)
+
+    # Fetch limit + 1 to check if there are more items
+    paginated_query = query.offset(params.offset).limit(params.limit + 1)
+
+    def generate() -> Iterator[bytes]:
+        result = db.execute(
+            paginated_query.execution_options(
+                yield_per=min(256, params.limit + 1), stream_results=True
+            )
+        )
+        count = 0
+        has_next = False
+
+        yield b'{"data":['
+        for item in result.scalars():
+            if count == params.limit:
+                has_next = True
+                break
+            if count:
+                yield b","
+            yield _dump_item(schema.model_validate(item, from_attributes=True))
+            count += 1
+        result.close()
+
+        pagination = OffsetPaginationMeta(
+            current_page=params.page,
+            page_size=params.limit,
+            has_next=has_next,
+            has_previous=params.page > 1
+        )
+        yield b'],"pagination":' + pagination.model_dump_json().encode() + b"}"
+
+    return StreamingResponse(generate(), media_type="application/json")
@@ -5,7 +5,7 @@ Shared schemas for both cursor-based and offset-based pagination
 """
 
 from typing import Generic, TypeVar, List, Optional
-from pydantic import BaseModel, Field
+from pydantic import BaseModel, ConfigDict, Field
 
 T = TypeVar("T")
 
@@ -31,10 +31,11 @@ class OffsetPagination(BaseModel):
     """Offset pagination metadata"""
     current_page: int = Field(..., ge=1, description="Current page number")
     page_size: int = Field(..., ge=1, description="Items per page")
-    total_items: int = Field(..., ge=0, description="Total number of items")
-    total_pages: int = Field(..., ge=0, description="Total number of pages")
+    total_items: Optional[int] = Field(None, ge=0, description="Total number of items, if counted")
+    total_pages: Optional[int] = Field(None, ge=0, description="Total number of pages, if counted")
     has_next: bool = Field(..., description="Whether there is a next page")
     has_previous: bool = Field(..., description="Whether there is a previous page")
+    estimated: bool = Field(False, description="Whether total_items is an estimate")
 
 
 class CursorPaginatedResponse(BaseModel, Generic[T]):
@@ -43,8 +44,7 @@ class CursorPaginatedResponse(BaseModel, Generic[T]):
     pagination: CursorPagination = Field(..., description="Pagination metadata")
     links: Optional[PaginationLinks] = Field(None, description="HATEOAS links")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)
 
 
 class OffsetPaginatedResponse(BaseModel, Generic[T]):
@@ -53,5 +53,4 @@ class OffsetPaginatedResponse(BaseModel, Generic[T]):
     pagination: OffsetPagination = Field(..., description="Pagination metadata")
     links: Optional[PaginationLinks] = Field(None, description="HATEOAS links")
 
-    class Config:
-        from_attributes = True
+    model_config = ConfigDict(from_attributes=True)